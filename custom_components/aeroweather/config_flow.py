@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import re
+from collections import ChainMap
+from typing import Any
+
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -9,6 +12,49 @@ from homeassistant.core import callback
 from .const import DOMAIN, CONF_ICAOS, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
 
 ICAO_RE = re.compile(r"^[A-Z0-9]{4}$")
+MIN_SCAN_INTERVAL = 30  # seconds
+
+
+def _parse_icaos(raw: Any) -> list[str]:
+    """Split a comma/semicolon separated ICAO string into a sorted, deduped list."""
+    icaos = [
+        s.strip().upper()
+        for s in str(raw or "").replace(";", ",").split(",")
+        if s.strip()
+    ]
+    if not icaos or any(not ICAO_RE.match(i) for i in icaos):
+        raise vol.Invalid("invalid_icao")
+    return sorted(set(icaos))
+
+
+# Validates submitted form data; error messages double as translation keys
+_INPUT_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ICAOS): _parse_icaos,
+        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+            vol.Coerce(int, msg="invalid_scan_interval"),
+            vol.Range(min=MIN_SCAN_INTERVAL, msg="invalid_scan_interval"),
+        ),
+    },
+    extra=vol.REMOVE_EXTRA,
+)
+
+def _form_schema(scan_interval: int) -> vol.Schema:
+    """
+    Form shown by both flows (plain types so the frontend can render it).
+
+    HA applies the step's data_schema to the submitted input, so the
+    interval's default is what a cleared field turns into.
+    """
+    return vol.Schema(
+        {
+            vol.Required(CONF_ICAOS): str,
+            vol.Optional(CONF_SCAN_INTERVAL, default=scan_interval): vol.Coerce(int),
+        }
+    )
+
+
+_USER_FORM_SCHEMA = _form_schema(DEFAULT_SCAN_INTERVAL)
 
 
 class AeroWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -18,37 +64,14 @@ class AeroWeatherConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            icaos = [
-                s.strip().upper()
-                for s in user_input[CONF_ICAOS].replace(";", ",").split(",")
-                if s.strip()
-            ]
-            if not icaos or any(not ICAO_RE.match(i) for i in icaos):
-                errors["base"] = "invalid_icao"
+            try:
+                data = _INPUT_SCHEMA(user_input)
+            except vol.Invalid as err:
+                errors["base"] = err.msg
             else:
-                return self.async_create_entry(
-                    title="AeroWeather",
-                    data={
-                        CONF_ICAOS: sorted(set(icaos)),
-                        CONF_SCAN_INTERVAL: int(
-                            user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-                        ),
-                    },
-                )
+                return self.async_create_entry(title="AeroWeather", data=data)
 
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_ICAOS): str,
-                vol.Optional(
-                    CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL
-                ): vol.Coerce(int),
-            }
-        )
-        return self.async_show_form(
-    step_id="user",
-    data_schema=schema,
-    errors=errors
-)
+        return self.async_show_form(step_id="user", data_schema=_USER_FORM_SCHEMA, errors=errors)
 
 
     @staticmethod
@@ -62,41 +85,30 @@ class AeroWeatherOptionsFlow(config_entries.OptionsFlow):
         self.entry = entry
 
     async def async_step_init(self, user_input=None):
-        current = {**self.entry.data, **self.entry.options}
+        current = ChainMap(self.entry.options, self.entry.data)
+        current_scan = current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
         errors = {}
 
         if user_input is not None:
-            icaos = [
-                s.strip().upper()
-                for s in user_input[CONF_ICAOS].replace(";", ",").split(",")
-                if s.strip()
-            ]
-            if not icaos or any(not ICAO_RE.match(i) for i in icaos):
-                errors["base"] = "invalid_icao"
-            else:
-                return self.async_create_entry(
-                    title="",
-                    data={
-                        CONF_ICAOS: sorted(set(icaos)),
-                        CONF_SCAN_INTERVAL: int(
-                            user_input.get(
-                                CONF_SCAN_INTERVAL,
-                                current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
-                            )
-                        ),
-                    },
+            try:
+                data = _INPUT_SCHEMA(
+                    {
+                        CONF_SCAN_INTERVAL: current_scan,
+                        **user_input,
+                    }
                 )
+            except vol.Invalid as err:
+                errors["base"] = err.msg
+            else:
+                return self.async_create_entry(title="", data=data)
 
-        schema = vol.Schema(
+        # Default to the entry's own interval so clearing the field keeps it
+        schema = self.add_suggested_values_to_schema(
+            _form_schema(current_scan),
             {
-                vol.Required(
-                    CONF_ICAOS, default=",".join(current.get(CONF_ICAOS, []))
-                ): str,
-                vol.Optional(
-                    CONF_SCAN_INTERVAL,
-                    default=current.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
-                ): vol.Coerce(int),
-            }
+                CONF_ICAOS: ",".join(current.get(CONF_ICAOS, [])),
+                CONF_SCAN_INTERVAL: current_scan,
+            },
         )
         return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
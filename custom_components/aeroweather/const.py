@@ -11,6 +11,15 @@ DOMAIN = "aeroweather"
 CONF_ICAOS = "icaos"
 CONF_SCAN_INTERVAL = "scan_interval"
 
+# Field elevations (ft MSL) used for density altitude. Only these stations
+# get a density altitude; any other ICAO reports it as unknown.
+DEFAULT_ELEVATIONS_FT: dict[str, int] = {
+    "KCLT": 748,
+    "KINT": 969,
+    "KRUQ": 772,
+    "KEXX": 733,
+}
+
 DEFAULT_NOTAM_SCAN_INTERVAL = 15  # minutes
 
 NOTAM_SEVERITY_GREEN = "GREEN"
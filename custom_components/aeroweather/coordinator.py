@@ -2,21 +2,32 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import ChainMap
 from datetime import timedelta
-from typing import Any
+from typing import Any, Mapping
 
 from aiohttp import ClientError, ClientSession
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import MAX_LENGTH_STATE_STATE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-
-from .const import DOMAIN, CONF_ICAOS, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-
-from .notams import fetch_notams
-from .notam_helpers import classify_notam
-
-self.data["notams"][icao] = processed_notams
+from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
+
+from .const import (
+    DOMAIN,
+    CONF_ICAOS,
+    CONF_SCAN_INTERVAL,
+    DEFAULT_ELEVATIONS_FT,
+    DEFAULT_SCAN_INTERVAL,
+)
+from .metar_helpers import (
+    RAW_METAR_KEYS,
+    decode_metar,
+    raw_metar_text,
+    raw_taf_text,
+    slim_attributes,
+)
 
 _LOGGER = logging.getLogger(__name__)
 BASE = "https://aviationweather.gov/api/data"
@@ -29,17 +40,45 @@ def _row_icao(row: dict[str, Any]) -> str | None:
     return str(icao).upper().strip()
 
 
+def _extract_rows(payload: Any, endpoint: str) -> list[dict[str, Any]]:
+    # Normalize list vs wrapped dict responses
+    if isinstance(payload, list):
+        return [p for p in payload if isinstance(p, dict)]
+    if isinstance(payload, dict):
+        for key in ("data", "results", endpoint):
+            val = payload.get(key)
+            if isinstance(val, list):
+                return [p for p in val if isinstance(p, dict)]
+    return []
+
+
+def _conditional_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """Build If-None-Match / If-Modified-Since from a response's ETag / Last-Modified."""
+    out: dict[str, str] = {}
+    if etag := headers.get("ETag"):
+        out["If-None-Match"] = etag
+    if last_modified := headers.get("Last-Modified"):
+        out["If-Modified-Since"] = last_modified
+    return out
+
+
 class AeroWeatherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.entry = entry
         self.session: ClientSession = async_get_clientsession(hass)
 
-        data = {**entry.data, **(entry.options or {})}
+        # Options override data; ChainMap looks up without merging into a new dict
+        data = ChainMap(entry.options or {}, entry.data)
         self.icaos = [
             str(s).upper().strip()
             for s in (data.get(CONF_ICAOS, []) or [])
             if s and str(s).strip()
         ]
+        # The ICAO list only changes on reload, so join it once
+        self._ids = ",".join(self.icaos)
+        # Per-endpoint conditional GET state (see _fetch)
+        self._validators: dict[str, dict[str, str]] = {}
+        self._rows_cache: dict[str, list[dict[str, Any]]] = {}
         scan = int(data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
 
         super().__init__(
@@ -47,42 +86,66 @@ class AeroWeatherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             logger=_LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=scan),
-            update_method=self._async_update,
         )
 
     async def _fetch(self, endpoint: str, ids: str) -> list[dict[str, Any]]:
         url = f"{BASE}/{endpoint}"
+        # Conditional GET: replay the validators from the last full response
+        headers = self._validators.get(endpoint, {})
         try:
-            async with self.session.get(url, params={"ids": ids, "format": "json"}, timeout=20) as resp:
+            async with self.session.get(
+                url, params={"ids": ids, "format": "json"}, headers=headers, timeout=20
+            ) as resp:
+                # 304 = unchanged since the last poll; reuse the rows parsed then
+                if resp.status == 304:
+                    return self._rows_cache.get(endpoint, [])
                 # 204 = no content (common for TAF at some stations)
                 if resp.status == 204:
+                    self._validators.pop(endpoint, None)
+                    self._rows_cache.pop(endpoint, None)
                     return []
                 resp.raise_for_status()
 
-                # Some APIs send odd content-types; accept anyway
-                payload = await resp.json(content_type=None)
+                # Decode the raw bytes with HA's orjson-backed loader; this also
+                # skips aiohttp's content-type check (some APIs send odd ones)
+                raw = await resp.read()
+                validators = _conditional_headers(resp.headers)
 
         except (ClientError, asyncio.TimeoutError) as err:
             raise UpdateFailed(f"{endpoint} fetch failed: {err}") from err
 
-        # Normalize list vs wrapped dict responses
-        if isinstance(payload, list):
-            return [p for p in payload if isinstance(p, dict)]
-        if isinstance(payload, dict):
-            for key in ("data", "results", endpoint):
-                val = payload.get(key)
-                if isinstance(val, list):
-                    return [p for p in val if isinstance(p, dict)]
-        return []
-
-    async def _async_update(self) -> dict[str, Any]:
+        # An empty 200 body means no rows, same as 204
+        if not raw.strip():
+            self._validators.pop(endpoint, None)
+            self._rows_cache.pop(endpoint, None)
+            return []
+
+        try:
+            payload = json_loads(raw)
+        except JSON_DECODE_EXCEPTIONS as err:
+            raise UpdateFailed(f"{endpoint} returned invalid JSON: {err}") from err
+        del raw
+
+        rows = _extract_rows(payload, endpoint)
+
+        # Only keep a copy if the provider gave us something to revalidate with
+        if validators:
+            self._validators[endpoint] = validators
+            self._rows_cache[endpoint] = rows
+        else:
+            self._validators.pop(endpoint, None)
+            self._rows_cache.pop(endpoint, None)
+        return rows
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        # Nothing configured: skip the API entirely
         if not self.icaos:
-            return {"metar": {}, "taf": {}}
+            return {"metar": {}, "taf": {}, "derived": {}, "metar_attrs": {}, "metar_raw": {}, "taf_raw": {}}
 
-        ids = ",".join(self.icaos)
+        # One batched request per endpoint, both endpoints in flight at once
         metars, tafs = await asyncio.gather(
-            self._fetch("metar", ids),
-            self._fetch("taf", ids),
+            self._fetch("metar", self._ids),
+            self._fetch("taf", self._ids),
         )
 
         metar_map: dict[str, Any] = {}
@@ -98,6 +161,40 @@ class AeroWeatherCoordinator(DataUpdateCoordinator[dict[str, Any]]):
             if icao:
                 taf_map[icao] = t
 
+        # Decode each METAR once here; sensors only read the results
+        derived_map: dict[str, Any] = {}
+        for icao, m in metar_map.items():
+            # One malformed report must not fail the refresh for every station
+            try:
+                derived_map[icao] = decode_metar(m, DEFAULT_ELEVATIONS_FT.get(icao))
+            except (ArithmeticError, TypeError, ValueError):
+                _LOGGER.warning("AeroWeather could not decode METAR for %s", icao, exc_info=True)
+
+        # Resolve the raw-text aliases once. Kept outside the guarded decode so
+        # the raw METAR still shows when the rest of the report is malformed.
+        metar_raw = {icao: raw_metar_text(m) for icao, m in metar_map.items()}
+
+        # HA drops a state longer than MAX_LENGTH_STATE_STATE, so the raw text
+        # is only left out of the attributes when the state can carry it.
+        # Otherwise the row is exposed as-is, as TAF rows are (raw TAFs often
+        # exceed the limit), and the attribute holds the only full copy.
+        metar_attrs = {
+            icao: slim_attributes(m, RAW_METAR_KEYS)
+            if len(metar_raw[icao] or "") <= MAX_LENGTH_STATE_STATE
+            else m
+            for icao, m in metar_map.items()
+        }
+
+        # TAF rows are exposed as-is; see metar_attrs above
+        taf_raw = {icao: raw_taf_text(t) for icao, t in taf_map.items()}
+
         _LOGGER.debug("AeroWeather got METAR=%s TAF=%s", list(metar_map), list(taf_map))
 
-        return {"metar": metar_map, "taf": taf_map}
+        return {
+            "metar": metar_map,
+            "taf": taf_map,
+            "derived": derived_map,
+            "metar_attrs": metar_attrs,
+            "metar_raw": metar_raw,
+            "taf_raw": taf_raw,
+        }
@@ -0,0 +1,408 @@
+"""
+METAR decoding helpers for AeroWeather (pure Python, no Home Assistant imports).
+
+The coordinator runs decode_metar() once per station per refresh and stores
+the result under data["derived"], so every sensor reading the same METAR
+shares one decode instead of re-parsing it.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from math import isfinite
+from typing import Any, Callable
+import re
+
+
+def _first_present(d: dict[str, Any], keys: tuple[str, ...]) -> Any:
+    for k in keys:
+        v = d.get(k)
+        if v is not None:
+            return v
+    return None
+
+
+# Provider keys that may carry the raw report text, in priority order
+RAW_METAR_KEYS = ("rawOb", "rawText", "text", "metar")
+RAW_TAF_KEYS = ("rawTAF", "rawText", "text", "taf")
+
+
+def raw_metar_text(row: dict[str, Any]) -> str | None:
+    """Return the raw METAR text from a provider row, whichever key carries it."""
+    return _first_present(row, RAW_METAR_KEYS)
+
+
+def raw_taf_text(row: dict[str, Any]) -> str | None:
+    """Return the raw TAF text from a provider row, whichever key carries it."""
+    return _first_present(row, RAW_TAF_KEYS)
+
+
+ALTIM_HPA_PER_INHG = 33.8638866667
+METERS_PER_SM = 1609.344
+
+# Reciprocals so the hot conversions multiply instead of divide
+_ALTIM_INHG_PER_HPA = 1.0 / ALTIM_HPA_PER_INHG
+_SM_PER_METER = 1.0 / METERS_PER_SM
+
+_ALTIM_A_RE = re.compile(r"\bA(\d{4})\b")
+_ALTIM_Q_RE = re.compile(r"\bQ(\d{4})\b")
+
+def _altimeter_to_inhg(val: Any) -> float | None:
+    """Return altimeter setting in inHg from various possible inputs."""
+    if val is None:
+        return None
+
+    # Handle raw METAR tokens like "A3011" or "Q1013"
+    if isinstance(val, str):
+        s = val.strip().upper()
+        m = _ALTIM_A_RE.search(s)
+        if m:
+            return round(int(m.group(1)) / 100.0, 2)
+        m = _ALTIM_Q_RE.search(s)
+        if m:
+            return round(int(m.group(1)) * _ALTIM_INHG_PER_HPA, 2)
+
+        # fall through: maybe it's a numeric string
+        try:
+            val = float(s)
+        except ValueError:
+            return None
+
+    # Numeric path
+    f = _to_float(val)
+    if f is None:
+        return None
+
+    # Heuristic:
+    # - If it's > 80, it's definitely NOT inHg (likely hPa)
+    # - If it's ~25-35, it's probably already inHg
+    if f > 80:
+        return round(f * _ALTIM_INHG_PER_HPA, 2)
+    return round(f, 2)
+
+
+def _c_to_f(c: float) -> float:
+    return (c * 9.0 / 5.0) + 32.0
+
+
+def _pressure_altitude_ft(field_elev_ft: float, altimeter_inhg: float) -> float:
+    """
+    Pressure Altitude (ft) approximation:
+      PA ≈ field_elev + (29.92 - altimeter) * 1000
+    """
+    return field_elev_ft + (29.92 - altimeter_inhg) * 1000.0
+
+
+def _isa_temp_c_at_alt_ft(alt_ft: float) -> float:
+    """
+    ISA temp at altitude (°C):
+      ISA ≈ 15 - 2°C per 1000 ft
+    """
+    return 15.0 - 2.0 * (alt_ft / 1000.0)
+
+
+def _density_altitude_ft(field_elev_ft: float, altimeter_inhg: float, oat_c: float) -> float:
+    """
+    Density Altitude (ft) approximation:
+      DA ≈ PA + 120 * (OAT - ISA)
+    """
+    pa = _pressure_altitude_ft(field_elev_ft, altimeter_inhg)
+    isa = _isa_temp_c_at_alt_ft(pa)
+    return pa + 120.0 * (oat_c - isa)
+
+
+def _to_float(val: Any) -> float | None:
+    """Return val as a finite float, or None (NaN / inf count as missing)."""
+    if val is None:
+        return None
+    # Fast path: most METAR numbers arrive as JSON ints/floats already
+    if type(val) is int:
+        return float(val)
+    if type(val) is not float:
+        try:
+            val = float(val)
+        except (TypeError, ValueError):
+            return None
+    return val if isfinite(val) else None
+
+
+def _to_int(val: Any) -> int | None:
+    if val is None:
+        return None
+    if type(val) is int:
+        return val
+    f = _to_float(val)
+    return int(f) if f is not None else None
+
+
+# Canonical field -> provider aliases, in priority order. The decoders below
+# read only the canonical names.
+_CANONICAL: dict[str, tuple[str, ...]] = {
+    "flight_category": ("fltCat", "flightCategory", "fltcat"),
+    "wind_dir": ("wdir", "windDir", "wdirDegrees", "wind_dir_degrees"),
+    "wind_speed": ("wspd", "windSpeed", "wspdKt", "wind_speed_kt"),
+    "wind_gust": ("wgst", "windGust", "wgstKt", "wind_gust_kt"),
+    "visibility_sm": ("visib", "vis", "visibility", "visSm"),
+    "visibility_m": ("visibilityMeters", "visMeters", "vis_m"),
+    "altimeter": ("altim", "altimHg", "altimeter", "altim_inhg", "qnh", "QNH"),
+    "temp": ("temp", "tempC", "temperature", "tmpc"),
+    "dewpoint": ("dewp", "dewpoint", "dewpC", "dwpc"),
+    "wx": ("wxString", "presentWeather", "wx"),
+    "raw": RAW_METAR_KEYS,
+    "clouds": ("clouds",),
+}
+
+# AviationWeather.gov sends "base"; older payloads used "base_ft_agl"
+_CLD_BASE_KEYS = ("base", "base_ft_agl")
+
+
+def _cover(val: Any) -> str:
+    return str(val).strip().upper()
+
+
+def _cloud_layers(val: Any) -> list[tuple[str, float | None]]:
+    """
+    Normalize a "clouds" list to (upper-case cover, base ft AGL) pairs.
+
+    Runs once per METAR while canonicalizing, so the ceiling decoder compares
+    ready-made values; the provider's layer dicts are left untouched.
+    """
+    if not isinstance(val, list):
+        return []
+    return [
+        (
+            _cover(layer.get("cover") or layer.get("cvg") or ""),
+            _to_float(_first_present(layer, _CLD_BASE_KEYS)),
+        )
+        for layer in val
+        if isinstance(layer, dict)
+    ]
+
+
+# Conversion applied while canonicalizing; fields not listed pass through as-is
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "wind_dir": _to_int,
+    "wind_speed": _to_int,
+    "wind_gust": _to_int,
+    "visibility_sm": _to_float,
+    "visibility_m": _to_float,
+    "altimeter": _altimeter_to_inhg,
+    "temp": _to_float,
+    "dewpoint": _to_float,
+    "clouds": _cloud_layers,
+}
+
+
+_KeyPlan = tuple[tuple[str, tuple[str, ...], Callable[[Any], Any] | None], ...]
+
+# Every provider key _canonicalize reads; anything else cannot change the plan
+_ALL_ALIASES = frozenset(a for aliases in _CANONICAL.values() for a in aliases)
+
+
+@lru_cache(maxsize=64)
+def _key_plan(present: frozenset[str]) -> _KeyPlan:
+    """
+    Specialize _CANONICAL to the aliases one METAR carries.
+
+    Returns (canonical field, aliases present, converter) triples, aliases in
+    priority order. The cache key is only the alias subset (not the full key
+    tuple), so reports that differ in order or in keys we never read share a
+    plan, and the number of plans is bounded by the optional fields we decode.
+    """
+    return tuple(
+        (canon, hits, _CONVERTERS.get(canon))
+        for canon, aliases in _CANONICAL.items()
+        if (hits := tuple(a for a in aliases if a in present))
+    )
+
+
+def _canonicalize(metar: dict[str, Any]) -> dict[str, Any]:
+    """
+    Map provider keys onto canonical field names and convert their values.
+
+    Only the aliases this METAR actually carries are touched; the
+    first non-None one (in _CANONICAL order) wins and is passed through the
+    field's converter, so the decoders below read ready-to-use values.
+    """
+    out: dict[str, Any] = {}
+    for canon, aliases, conv in _key_plan(_ALL_ALIASES.intersection(metar)):
+        for alias in aliases:
+            val = metar[alias]
+            if val is not None:
+                out[canon] = conv(val) if conv else val
+                break
+    return out
+
+
+_CEIL_COVERS = frozenset(("BKN", "OVC", "VV"))
+
+
+def _ceiling_ft(metar: dict[str, Any]) -> float | None:
+    """
+    Return ceiling in feet AGL (lowest BKN / OVC / VV layer).
+    If no ceiling is reported (CLR / SKC / FEW / SCT only),
+    return None so the sensor stays numeric.
+
+    Reads the "clouds" layer list; covers and bases arrive already
+    normalized by _canonicalize.
+    """
+    # Running minimum: one pass, no candidate list
+    best: float | None = None
+    for cover, base in metar.get("clouds") or ():
+        if cover in _CEIL_COVERS and base is not None and (best is None or base < best):
+            best = base
+    return best
+
+
+_FLIGHT_CATEGORIES = ("LIFR", "IFR", "MVFR", "VFR")
+
+
+def _flight_category_code(ceiling_ft: float, vis_sm: float) -> int:
+    """
+    Index into _FLIGHT_CATEGORIES for a ceiling / visibility pair.
+
+    Compute (FAA-ish): VFR >=3000 and >=5; MVFR 1000-2999 or 3-4;
+    IFR 500-999 or 1-2; LIFR <500 or <1
+    """
+    if ceiling_ft < 500 or vis_sm < 1.0:
+        return 0
+    if ceiling_ft < 1000 or vis_sm < 3.0:
+        return 1
+    if ceiling_ft < 3000 or vis_sm < 5.0:
+        return 2
+    return 3
+
+
+def _flight_category_from_metar(
+    metar: dict[str, Any], ceiling: float | None, vis_sm: float | None
+) -> str | None:
+    """
+    Prefer fltCat from API if present; else compute from ceiling/visibility.
+
+    ceiling / vis_sm are the values decode_metar() already produced for the
+    ceiling and visibility sensors, so they are not decoded a second time.
+    """
+    fltcat = metar.get("flight_category")
+    reported = fltcat.strip() if isinstance(fltcat, str) else ""
+    if reported:
+        # The API's own category wins; the thresholds below are only a fallback
+        return reported.upper()
+
+    # If we have neither, can't compute reliably
+    if ceiling is None and vis_sm is None:
+        return None
+
+    # Use very high ceiling if missing; same for vis
+    ceiling_eff = ceiling if ceiling is not None else 99999
+    vis_eff = vis_sm if vis_sm is not None else 99.0
+
+    return _FLIGHT_CATEGORIES[_flight_category_code(ceiling_eff, vis_eff)]
+
+
+_VIS_RE = re.compile(r"\b(?:(P)?(\d+)(?:\s+(\d+)/(\d+))?|(\d+)/(\d+))SM\b")
+
+def _parse_vis_from_raw_sm(raw: str) -> float | None:
+    """Parse visibility in SM from raw METAR like 10SM, P6SM, 1 1/2SM, 3/4SM."""
+    if not raw:
+        return None
+
+    m = _VIS_RE.search(raw)
+    if not m:
+        # CAVOK implies >=10km (~6.2SM)
+        if "CAVOK" in raw:
+            return 6.2
+        return None
+
+    whole = m.group(2)
+    num1, den1 = m.group(3), m.group(4)
+    num2, den2 = m.group(5), m.group(6)
+
+    # A zero denominator (e.g. a garbled "1/0SM") means no usable visibility
+    den = den1 or den2
+    if den is not None and int(den) == 0:
+        return None
+
+    vis = float(whole) if whole else 0.0
+    if num1 and den1:
+        vis += float(num1) / float(den1)
+    elif num2 and den2:
+        vis += float(num2) / float(den2)
+
+    return vis
+
+
+def _visibility_sm(metar: dict[str, Any]) -> float | None:
+    # 1) Try structured numeric fields first
+    vis_sm = metar.get("visibility_sm")
+    if vis_sm is not None:
+        return vis_sm
+
+    # 2) Try meters → miles
+    vis_m = metar.get("visibility_m")
+    if vis_m is not None:
+        return vis_m * _SM_PER_METER
+
+    # 3) Fallback: parse from raw METAR text (e.g., 10SM, 1 1/2SM, P6SM)
+    raw = metar.get("raw")
+    if isinstance(raw, str):
+        return _parse_vis_from_raw_sm(raw)
+
+    return None
+
+
+def _wx_string(metar: dict[str, Any]) -> str | None:
+    wx = metar.get("wx")
+    if not wx:
+        return None
+    if isinstance(wx, list):
+        return " ".join([str(x) for x in wx if x])
+    return str(wx).strip() or None
+
+
+def slim_attributes(item: dict[str, Any], raw_keys: tuple[str, ...]) -> dict[str, Any]:
+    """
+    Copy of a METAR row for use as state attributes.
+
+    The raw text is already the sensor's state, so it is left out rather than
+    serialized a second time on every state write. Only use this when the raw
+    text fits in the state; the coordinator keeps the full row otherwise.
+    """
+    return {k: v for k, v in item.items() if k not in raw_keys}
+
+
+def decode_metar(metar: dict[str, Any], field_elev_ft: int | None = None) -> dict[str, Any]:
+    """
+    Decode every sensor value for one METAR.
+
+    field_elev_ft:
+      Station elevation; density altitude is only computed when it is known.
+
+    Returns a dict keyed by sensor description key, e.g.:
+      { "flight_category": "VFR", "wind_dir": 220, "ceiling": 2500.0, ... }
+    """
+    metar = _canonicalize(metar)
+    ceiling = _ceiling_ft(metar)
+    visibility = _visibility_sm(metar)
+    altimeter = metar.get("altimeter")
+    temp = metar.get("temp")
+
+    density_altitude: int | None = None
+    if field_elev_ft is not None and altimeter is not None and temp is not None:
+        da = _density_altitude_ft(float(field_elev_ft), altimeter, temp)
+        # Absurd-but-finite inputs can still overflow to inf
+        if isfinite(da):
+            density_altitude = int(round(da))
+
+    return {
+        "flight_category": _flight_category_from_metar(metar, ceiling, visibility),
+        "wind_dir": metar.get("wind_dir"),
+        "wind_speed": metar.get("wind_speed"),
+        "wind_gust": metar.get("wind_gust"),
+        "visibility": visibility,
+        "ceiling": ceiling,
+        "altimeter": altimeter,
+        "temp": temp,
+        "density_altitude": density_altitude,
+        "dewpoint": metar.get("dewpoint"),
+        "wx": _wx_string(metar),
+    }
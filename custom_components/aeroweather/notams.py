@@ -16,7 +16,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Mapping
+from itertools import islice
+from typing import Any, Iterable, Iterator, Mapping
 import asyncio
 import logging
 
@@ -43,11 +44,26 @@ class NotamApiConfig:
 
     page_size:
       If provider supports paging. Used as a hint via common param names.
+
+    max_concurrency:
+      Upper bound on NOTAM requests in flight at once during a bulk fetch,
+      so a long ICAO list does not open one socket per airport.
+
+    supports_bulk_ids:
+      Set if the provider accepts a comma-separated ICAO list in its location
+      parameter. Bulk fetches then send batch_size ICAOs per request instead
+      of one request per ICAO.
+
+    batch_size:
+      ICAOs per request when supports_bulk_ids is set.
     """
     base_url: str
     api_key: str | None = None
     timeout_s: int = 20
     page_size: int = 200
+    max_concurrency: int = 8
+    supports_bulk_ids: bool = False
+    batch_size: int = 10
 
 
 def _build_headers(cfg: NotamApiConfig) -> dict[str, str]:
@@ -84,30 +100,16 @@ def _extract_list(payload: Any) -> list[dict[str, Any]]:
     raise ValueError("Unexpected NOTAM payload shape (expected list or dict with notams/items/data/results).")
 
 
-async def fetch_notams_for_icao(
-    session: ClientSession,
-    icao: str,
-    cfg: NotamApiConfig,
-) -> list[dict[str, Any]]:
-    """
-    Fetch NOTAMs for one ICAO.
-
-    Parameters sent are "best-effort defaults" that work with many APIs.
-    Once we lock your provider, we will tune these exactly.
-    """
-    icao = (icao or "").strip().upper()
-    if len(icao) != 4:
-        raise ValueError(f"ICAO must be 4 letters, got: {icao!r}")
-
+def _build_params(location: str, cfg: NotamApiConfig, now_iso: str) -> dict[str, str]:
     # Common parameter names used by various NOTAM APIs.
     # We include multiple aliases because some providers accept one of them.
-    params: dict[str, str] = {
+    return {
         # location
-        "location": icao,
-        "icaoLocation": icao,
-        "airport": icao,
+        "location": location,
+        "icaoLocation": location,
+        "airport": location,
         # time bounding (many providers default to "active"; some want explicit windows)
-        "effectiveBefore": _utc_now_iso(),
+        "effectiveBefore": now_iso,
         # paging hints
         "pageSize": str(cfg.page_size),
         "limit": str(cfg.page_size),
@@ -115,6 +117,34 @@ async def fetch_notams_for_icao(
         "active": "true",
     }
 
+
+def _notam_location(notam: Mapping[str, Any]) -> str | None:
+    loc = notam.get("icaoLocation") or notam.get("location") or notam.get("airport")
+    if not loc:
+        # FAA NMS-style GeoJSON nests it: properties.coreNOTAMData.notam
+        props = notam.get("properties")
+        core = props.get("coreNOTAMData") if isinstance(props, Mapping) else None
+        inner = core.get("notam") if isinstance(core, Mapping) else None
+        if isinstance(inner, Mapping):
+            loc = inner.get("icaoLocation") or inner.get("location")
+    if not loc:
+        return None
+    return str(loc).strip().upper()
+
+
+def _chunked(items: Iterable[str], size: int) -> Iterator[list[str]]:
+    it = iter(items)
+    while chunk := list(islice(it, max(1, size))):
+        yield chunk
+
+
+async def _get_notams(
+    session: ClientSession,
+    location: str,
+    cfg: NotamApiConfig,
+    now_iso: str,
+) -> list[dict[str, Any]]:
+    params = _build_params(location, cfg, now_iso)
     headers = _build_headers(cfg)
     timeout = ClientTimeout(total=cfg.timeout_s)
 
@@ -123,24 +153,96 @@ async def fetch_notams_for_icao(
             resp.raise_for_status()
             payload = await resp.json(content_type=None)
     except asyncio.TimeoutError as err:
-        raise RuntimeError(f"NOTAM request timed out for {icao} (base_url={cfg.base_url})") from err
+        raise RuntimeError(f"NOTAM request timed out for {location} (base_url={cfg.base_url})") from err
     except ClientResponseError as err:
         # Helpful log: status + URL
         raise RuntimeError(
-            f"NOTAM request failed for {icao}: HTTP {err.status} (base_url={cfg.base_url})"
+            f"NOTAM request failed for {location}: HTTP {err.status} (base_url={cfg.base_url})"
         ) from err
     except Exception as err:
-        raise RuntimeError(f"NOTAM request failed for {icao} (base_url={cfg.base_url}): {err}") from err
+        raise RuntimeError(f"NOTAM request failed for {location} (base_url={cfg.base_url}): {err}") from err
 
     try:
         notams = _extract_list(payload)
     except Exception as err:
-        _LOGGER.debug("Raw NOTAM payload for %s: %s", icao, payload)
+        _LOGGER.debug("Raw NOTAM payload for %s: %s", location, payload)
         raise
 
     return notams
 
 
+async def fetch_notams_for_icao(
+    session: ClientSession,
+    icao: str,
+    cfg: NotamApiConfig,
+    now_iso: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Fetch NOTAMs for one ICAO.
+
+    Parameters sent are "best-effort defaults" that work with many APIs.
+    Once we lock your provider, we will tune these exactly.
+
+    now_iso:
+      Optional. UTC timestamp for the effectiveBefore window; defaults to now.
+      Bulk callers pass one value so it is not recomputed per ICAO.
+    """
+    icao = (icao or "").strip().upper()
+    if len(icao) != 4:
+        raise ValueError(f"ICAO must be 4 letters, got: {icao!r}")
+
+    return await _get_notams(session, icao, cfg, now_iso or _utc_now_iso())
+
+
+async def _fetch_batch(
+    session: ClientSession,
+    icaos_chunk: list[str],
+    cfg: NotamApiConfig,
+    now_iso: str,
+) -> dict[str, list[dict[str, Any]]] | None:
+    """
+    Fetch NOTAMs for several ICAOs in one request (cfg.supports_bulk_ids).
+
+    The provider returns one flat list; it is split back per ICAO using each
+    NOTAM's location field. NOTAMs for locations we did not ask for are dropped.
+
+    Returns None if the provider returned NOTAMs but none of them could be
+    matched to a requested ICAO; the caller then fetches the chunk one ICAO at
+    a time rather than report zero NOTAMs for every station.
+    """
+    notams = await _get_notams(session, ",".join(icaos_chunk), cfg, now_iso)
+    if len(icaos_chunk) == 1:
+        # Only one location was asked for, so there is nothing to split
+        return {icaos_chunk[0]: notams}
+
+    grouped: dict[str, list[dict[str, Any]]] = {i: [] for i in icaos_chunk}
+    dropped = 0
+    for notam in notams:
+        bucket = grouped.get(_notam_location(notam) or "")
+        if bucket is None:
+            dropped += 1
+            _LOGGER.debug("Dropping NOTAM with unexpected location: %s", notam)
+            continue
+        bucket.append(notam)
+
+    if dropped and dropped == len(notams):
+        _LOGGER.warning(
+            "None of %d NOTAMs for %s had a recognizable location; falling back to per-ICAO requests",
+            dropped,
+            ",".join(icaos_chunk),
+        )
+        return None
+    if dropped:
+        _LOGGER.warning(
+            "Dropped %d of %d NOTAMs for %s with an unrecognized location",
+            dropped,
+            len(notams),
+            ",".join(icaos_chunk),
+        )
+
+    return grouped
+
+
 async def fetch_notams_bulk(
     session: ClientSession,
     icaos: list[str],
@@ -149,15 +251,51 @@ async def fetch_notams_bulk(
     """
     Fetch NOTAMs for multiple ICAOs concurrently.
 
+    Pass the caller's shared session (Home Assistant's async_get_clientsession)
+    so all requests reuse its keep-alive connection pool; this module never
+    creates a ClientSession of its own. At most cfg.max_concurrency requests
+    are in flight at once.
+
+    If the provider supports_bulk_ids, ICAOs are sent batch_size at a time;
+    otherwise one request is made per ICAO. A batch whose NOTAMs cannot be
+    attributed to any requested ICAO is retried one ICAO at a time.
+    Duplicates and entries that are not 4 characters are dropped before any
+    request is made.
+
     Returns:
       { "KCLT": [...], "KRUQ": [...], ... }
     """
-    clean_icaos = [i.strip().upper() for i in (icaos or []) if i and i.strip()]
+    # Normalize, validate and dedupe in one pass, preserving order
+    seen: set[str] = set()
+    clean_icaos: list[str] = []
+    for raw in icaos or ():
+        icao = (raw or "").strip().upper()
+        if len(icao) == 4 and icao not in seen:
+            seen.add(icao)
+            clean_icaos.append(icao)
+
     results: dict[str, list[dict[str, Any]]] = {}
+    sem = asyncio.Semaphore(max(1, cfg.max_concurrency))
+    # One time window for the whole bulk fetch
+    now_iso = _utc_now_iso()
 
     async def _one(i: str) -> None:
-        results[i] = await fetch_notams_for_icao(session, i, cfg)
+        async with sem:
+            # Already validated above, skip fetch_notams_for_icao's check
+            results[i] = await _get_notams(session, i, cfg, now_iso)
+
+    if cfg.supports_bulk_ids:
+        async def _batch(chunk: list[str]) -> None:
+            async with sem:
+                grouped = await _fetch_batch(session, chunk, cfg, now_iso)
+            # Released the slot first: the fallback requests take their own
+            if grouped is None:
+                await asyncio.gather(*[_one(i) for i in chunk])
+            else:
+                results.update(grouped)
+
+        await asyncio.gather(*[_batch(c) for c in _chunked(clean_icaos, cfg.batch_size)])
+        return results
 
     await asyncio.gather(*[_one(i) for i in clean_icaos])
     return results
-